@@ -16,6 +16,7 @@
 # along with Marcel.  If not, see <https://www.gnu.org/licenses/>.
 
 import getpass
+import io
 import os
 import signal
 import sys
@@ -46,7 +47,10 @@ from marcel.api import *
 # on a thread so that stdin can be monitored for the kill signal and then acted upon.
 
 
-TRACE = marcel.util.Trace(f'/tmp/farcel-{os.getuid()}.log')
+# Tracing is off unless FARCEL_TRACE=1 is set in farcel's environment. (Tracing every pickled item
+# dominates the cost of farcel when it's on.)
+TRACE = marcel.util.Trace(f'/tmp/farcel-{os.getuid()}.log',
+                          enabled=os.environ.get('FARCEL_TRACE') == '1')
 
 
 class PythonVersionMismatch(Exception):
@@ -63,9 +67,18 @@ class PythonVersionMismatch(Exception):
 
 class PickleOutput(marcel.core.Op):
 
+    # Pickled output is written through a large buffer, so that streaming many small objects
+    # doesn't result in a write syscall (or several) per object.
+    BUFFER_SIZE = 1 << 20
+
     def __init__(self):
         super().__init__()
-        self.pickler = dill.Pickler(sys.stdout.buffer)
+        # closefd=False: Closing (or garbage collecting) the buffer must not close stdout.
+        # The GIL is released while the buffer is written to stdout, (FileIO.write releases it around the write
+        # syscall), so the main thread, monitoring stdin for a kill signal, isn't blocked by a slow reader.
+        self.buffer = io.BufferedWriter(io.FileIO(sys.stdout.fileno(), mode='wb', closefd=False),
+                                        buffer_size=PickleOutput.BUFFER_SIZE)
+        self.pickler = dill.Pickler(self.buffer)
 
     def __repr__(self):
         return 'pickleoutput()'
@@ -74,11 +87,17 @@ class PickleOutput(marcel.core.Op):
         pass
 
     def receive(self, env, x):
-        TRACE.write(f'Pickling: ({type(x)}) {x}')
+        if TRACE.enabled:
+            TRACE.write(f'Pickling: ({type(x)}) {x}')
         self.pickler.dump(x)
 
+    def flush(self, env):
+        self.flush_buffer()
+        super().flush(env)
+
     def cleanup(self):
         TRACE.write('Closing stdout')
+        self.flush_buffer()
         sys.stdout.buffer.close()
 
     def receive_error(self, env, error):
@@ -86,6 +105,12 @@ class PickleOutput(marcel.core.Op):
         self.pickler.dump(error)
         super().receive_error(env, error)
 
+    # For use by this module
+
+    def flush_buffer(self):
+        if not self.buffer.closed:
+            self.buffer.flush()
+
 
 class PipelineRunner(threading.Thread):
 
@@ -110,6 +135,8 @@ class PipelineRunner(threading.Thread):
             with TRACE.open() as file:
                 marcel.util.print_stack_of_current_exception(file)
             self.pickler.receive_error(self.env, marcel.object.error.Error(e))
+        finally:
+            self.pickler.flush_buffer()
         TRACE.write('PipelineRunner: Execution complete.')
 
     def check_python_version(self):
@@ -175,12 +175,14 @@ class ArgsParser:
     def str_to_float(self, arg, x):
         if type(x) is float or callable(x):
             return x
+        if type(x) is int:
+            return float(x)
         if type(x) is str:
             try:
                 return float(x)
             except ValueError:
                 raise ArgsError(arg.op_name, f'{arg.name} cannot be converted to float: {x}')
-        raise ArgsError(arg.op_name, f'{arg.name} must be a string: {x}')
+        raise ArgsError(arg.op_name, f'{arg.name} must be a float: {x}')
 
     def str_to_bool(self, arg, x):
         if type(x) is bool or callable(x):
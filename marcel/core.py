@@ -34,12 +34,18 @@ class AbstractOp(object):
 
 class Op(AbstractOp):
 
+    # Fields common to all ops are slots, for faster access on the per-item path, (send, receive_input).
+    # Other fields, including those of subclasses, are in __dict__ as usual.
+    __slots__ = ('_receiver', '_receive_input', 'owner', '_count')
+
     def __init__(self):
         super().__init__()
         # The following fields are set and have defined values only during the execution of a pipelines
         # containing this op.
-        # The op receiving this op's output
-        self.receiver = None
+        # The op receiving this op's output. Set via the receiver property, which also sets _receive_input.
+        self._receiver = None
+        # receiver.receive_input, bound once, when the receiver is set, instead of on every send.
+        self._receive_input = None
         # The pipelines to which this op belongs
         self.owner = None
         self._count = -1
@@ -47,6 +53,15 @@ class Op(AbstractOp):
     def __repr__(self):
         assert False, self.op_name()
 
+    @property
+    def receiver(self):
+        return self._receiver
+
+    @receiver.setter
+    def receiver(self, receiver):
+        self._receiver = receiver
+        self._receive_input = None if receiver is None else receiver.receive_input
+
     # Pipelineable
 
     def create_pipeline(self, args=None):
@@ -65,9 +80,21 @@ class Op(AbstractOp):
     def send(self, env, x):
         if env.trace.is_enabled():
             env.trace.write(self, x)
-        receiver = self.receiver
-        if receiver:
-            receiver.receive_input(env, x)
+        receive_input = self._receive_input
+        if receive_input is not None:
+            receive_input(env, x)
+
+    # Equivalent to calling send for each item of batch, but the receiver can process the batch
+    # without a receive_input call per item.
+    def send_batch(self, env, batch):
+        if env.trace.is_enabled():
+            # Keep trace output interleaved as it would be without batching.
+            for x in batch:
+                self.send(env, x)
+        else:
+            receiver = self._receiver
+            if receiver is not None:
+                receiver.receive_batch(env, batch)
 
     def send_error(self, env, error):
         if env.trace.is_enabled():
@@ -95,17 +122,34 @@ class Op(AbstractOp):
             self.fatal_error(env, args_description, str(e))
 
     # This function is performance-critical, so assertions are commented out,
-    # and util.wrap_op_input is inlined.
+    # and util.wrap_op_input is inlined. The try block stays: it costs nothing unless an exception
+    # is raised (Python >= 3.11), and catching KillAndResumeException here, rather than at the start
+    # of the pipeline, lets upstream ops carry on with the rest of their current input.
     def receive_input(self, env, x):
         # assert x is not None
         # assert not isinstance(x, Error)
         try:
             env.current_op = self
             self._count += 1
-            self.receive(env, x if type(x) in (tuple, list) else (x,))
+            # Same as marcel.util.wrap_op_input, (x is never None here), inlined. Identity tests are about
+            # twice as fast as type(x) in (tuple, list), which falls back to == for scalars.
+            t = type(x)
+            self.receive(env, x if t is tuple or t is list else (x,))
         except marcel.exception.KillAndResumeException as e:
             pass
 
+    # Like receive_input, for each item of batch. Also performance-critical: receive_input is inlined.
+    def receive_batch(self, env, batch):
+        receive = self.receive
+        for x in batch:
+            try:
+                env.current_op = self
+                self._count += 1
+                t = type(x)
+                receive(env, x if t is tuple or t is list else (x,))
+            except marcel.exception.KillAndResumeException as e:
+                pass
+
     def pos(self):
         return self._count
 
@@ -128,6 +172,8 @@ class Op(AbstractOp):
     def copy(self):
         copy = self.__class__()
         copy.__dict__.update(self.__dict__)
+        for slot in Op.__slots__:
+            setattr(copy, slot, getattr(self, slot))
         return copy
 
     def non_fatal_error(self, env, input=None, message=None, error=None):
@@ -405,7 +451,7 @@ class PipelineIterator:
 
     def __init__(self, env, pipeline):
         output = []
-        gather_op = env.op_modules['gather'].api_function()(output)
+        gather_op = env.gather_op(output)
         pipeline.append(gather_op)
         command = Command(None, pipeline)
         try:
@@ -224,6 +224,9 @@ class Environment(object):
         self.directory_state = None
         # Source of ops and arg parsers.
         self.op_modules = marcel.opmodule.import_op_modules()
+        # Constructors of ops that marcel creates internally, looked up once instead of per use.
+        self.gather_constructor = self.op_modules['gather'].api_function()
+        self.runpipeline_constructor = self.op_modules['runpipeline'].create_op
         # Lax var handling for now. Check immutability after startup is complete.
         self.var_handler = VarHandlerStartup(self)
         self.var_handler.add_immutable_vars('MARCEL_VERSION', 'HOME', 'PWD', 'DIRS', 'USER', 'HOST')
@@ -254,6 +257,12 @@ class Environment(object):
     def dir_state(self):
         return self.directory_state
 
+    def gather_op(self, output):
+        return self.gather_constructor(output)
+
+    def runpipeline_op(self):
+        return self.runpipeline_constructor()
+
     # Vars that are not mutable even during startup. I.e., startup script can't modify them.
     def never_mutable(self):
         return {'MARCEL_VERSION', 'HOME', 'USER', 'HOST'}
@@ -72,7 +72,8 @@ class File(marcel.object.renderable.Renderable):
 
     default_formatting = FileFormatting()
 
-    def __init__(self, path, base=None, metadata_cache=None):
+    # lstat, if provided, is the path's os.stat_result, not following symlinks, (e.g. from a DirEntry).
+    def __init__(self, path, base=None, metadata_cache=None, lstat=None):
         assert path is not None
         self.metadata_cache = metadata_cache
         if not isinstance(path, pathlib.Path):
@@ -80,7 +81,7 @@ class File(marcel.object.renderable.Renderable):
         self.path = path
         self.base = base
         self.compact_path = None
-        self.lstat = None
+        self.lstat = lstat
         self.executable = None
         # Used only to survive pickling
         self.path_str = None
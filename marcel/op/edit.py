@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with Marcel.  If not, see <https://www.gnu.org/licenses/>.
 
+import locale
 import os
 import readline
 import subprocess
@@ -124,10 +125,6 @@ class EditImpl(object):
 
 class EditCommand(EditImpl):
 
-    def __init__(self, op, editor):
-        super().__init__(op, editor)
-        _, self.tmp_file = tempfile.mkstemp(text=True)
-
     def run(self, env):
         # Remove the edit command from history
         readline.remove_history_item(readline.get_current_history_length() - 1)
@@ -135,22 +132,35 @@ class EditCommand(EditImpl):
             self.op.n = readline.get_current_history_length() - 1
         command = readline.get_history_item(self.op.n + 1)  # 1-based
         assert command is not None
-        with open(self.tmp_file, 'w') as output:
-            output.write(command)
-        self.edit(self.tmp_file)
-        with open(self.tmp_file, 'r') as input:
-            command_lines = input.readlines()
-        # Make sure that each new line after the first is preceded by a continuation string.
-        continued_correctly = []
-        correct_termination = env.reader.continuation + '\n'
-        for line in command_lines[:-1]:
-            if not line.endswith(correct_termination):
-                assert line[-1] == '\n', line
-                line = line[:-1] + correct_termination
-            continued_correctly.append(line)
-        continued_correctly.append(command_lines[-1])
-        env.edited_command = ''.join(continued_correctly)
-        os.remove(self.tmp_file)
+        # The file descriptor from mkstemp is used for writing, (and closed). The edited command is read
+        # by path, because an editor may save by replacing the file. The command is encoded as open()
+        # decodes, for reading it back.
+        fd, tmp_file = tempfile.mkstemp(text=True)
+        try:
+            try:
+                os.write(fd, command.encode(locale.getpreferredencoding(False)))
+            finally:
+                os.close(fd)
+            self.edit(tmp_file)
+            with open(tmp_file, 'r') as input:
+                edited_command = input.read()
+        finally:
+            os.remove(tmp_file)
+        env.edited_command = EditCommand.continue_lines(edited_command, env.reader.continuation)
+
+    # Make sure that each new line after the first is preceded by a continuation string. (A newline ending
+    # the last line doesn't need one.) Usually the command is one line, and is returned as is.
+    @staticmethod
+    def continue_lines(command, continuation):
+        if command.find('\n', 0, len(command) - 1) == -1:
+            return command
+        terminal_newline = command.endswith('\n')
+        lines = command[:-1].split('\n') if terminal_newline else command.split('\n')
+        continued_correctly = [line if line.endswith(continuation) else line + continuation
+                               for line in lines[:-1]]
+        continued_correctly.append(lines[-1])
+        command = '\n'.join(continued_correctly)
+        return command + '\n' if terminal_newline else command
 
 
 class EditStartup(EditImpl):
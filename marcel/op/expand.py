@@ -115,7 +115,9 @@ class Expander:
         if len(x) != 1:
             return x
         only = x[0]
-        if marcel.util.is_sequence(only) or marcel.util.is_generator(only):
+        # marcel.util.is_sequence inlined, (this runs for every input).
+        t = type(only)
+        if t is tuple or t is list or marcel.util.is_generator(only):
             return only
         elif isinstance(only, dict):
             return list(only.items())
@@ -143,20 +145,22 @@ class ComponentExpander(Expander):
         if self.position >= len(sequence):
             self.op.send(env, sequence)
         else:
-            assert self.position >= 0
-            assert self.position < len(sequence)
-            pre = sequence[:self.position]
-            post = sequence[(self.position + 1):]
-            assert type(pre) == type(post)
+            position = self.position
+            assert position >= 0
+            # Each output is a copy of template, with an expanded item at position. This creates one
+            # tuple (or list) per output, instead of concatenating the parts before and after position.
+            template = list(sequence)
             send = self.op.send
-            if type(pre) is tuple:
-                for x in Expander.expand([sequence[self.position]]):
-                    send(env, pre + (x,) + post)
-            elif type(pre) is list:
-                for x in Expander.expand([sequence[self.position]]):
-                    send(env, pre + [x,] + post)
+            if type(sequence) is tuple:
+                for x in Expander.expand([sequence[position]]):
+                    template[position] = x
+                    send(env, tuple(template))
+            elif type(sequence) is list:
+                for x in Expander.expand([sequence[position]]):
+                    template[position] = x
+                    send(env, template.copy())
             else:
-                assert False, f'Unanticipated input type: ({type(pre)}) {pre}'
+                assert False, f'Unanticipated input type: ({type(sequence)}) {sequence}'
 
 class NotExpandableException(Exception):
     not_expandable = None
@@ -13,8 +13,11 @@
 # You should have received a copy of the GNU General Public License
 # along with Marcel.  If not, see <https://www.gnu.org/licenses/>.
 
+import concurrent.futures
 import os
 import pathlib
+import stat
+import time
 import types
 
 import marcel.argsparser
@@ -59,12 +62,18 @@ class FilenamesOp(marcel.core.Op):
         self.current_dir = None
         self.roots = None
         self.base = None
-        # emitted_paths is maintained to avoid visiting the same path repeatedly, as might happen
-        # with roots containing wildcards. E.g., a? and ?x would both identify a file names ax.
+        # emitted_paths is maintained to avoid emitting the same path repeatedly, as happens when one root
+        # is inside another, e.g. ls -r a a/b. (Duplicate roots, e.g. from a? and ?x, are eliminated by
+        # Filenames.normalize.) Roots that don't overlap can't yield the same path, and then emitted_paths
+        # is None, to avoid a set entry per file. Paths are stored as strs, which are smaller and cheaper to
+        # hash than pathlib.Paths. (Keying on (st_dev, st_ino) instead would wrongly suppress hard links to
+        # an already emitted file.)
         self.emitted_paths = None
         # Set of visited directories, used to avoid revisiting directories via symlinks. Directories
         # are identified by (stat.st_dev, stat.st_ino).
         self.visited_dirs = None
+        # File types to be included, as stat.S_IFMT values, derived from file, dir, symlink.
+        self.file_types = None
         self.metadata_cache = None
         self.formatting = None
 
@@ -78,7 +87,6 @@ class FilenamesOp(marcel.core.Op):
         if len(self.filenames) > 0 and len(self.roots) == 0:
             raise marcel.exception.KillCommandException(f'No qualifying paths, (possibly due to permission errors):'
                                                         f' {self.filenames}')
-        self.emitted_paths = set()
         self.visited_dirs = set()
         if len(self.roots) == 0:
             self.roots = [self.current_dir]
@@ -88,7 +96,15 @@ class FilenamesOp(marcel.core.Op):
             self.file = True
             self.dir = True
             self.symlink = True
+        self.file_types = set()
+        if self.file:
+            self.file_types.add(stat.S_IFREG)
+        if self.dir:
+            self.file_types.add(stat.S_IFDIR)
+        if self.symlink:
+            self.file_types.add(stat.S_IFLNK)
         self.roots = sorted(self.roots)
+        self.emitted_paths = set() if self.roots_overlap() else None
         self.determine_base()
         self.metadata_cache = marcel.object.file.MetadataCache()
         self.formatting = marcel.object.file.FileFormatting()
@@ -96,39 +112,62 @@ class FilenamesOp(marcel.core.Op):
     # Op
 
     def run(self, env):
-        for root in self.roots:
-            try:
-                self.visit(env, root, 0)
-            except marcel.exception.KillAndResumeException:
-                pass
+        directory_reader = DirectoryReader(recursive=self.dr)
+        try:
+            for root in self.roots:
+                try:
+                    self.visit(env, root, directory_reader)
+                except marcel.exception.KillAndResumeException:
+                    pass
+        finally:
+            directory_reader.shutdown()
 
     # For use by this class
 
-    def visit(self, env, root, level):
-        file = File(root, self.base, self.metadata_cache)
-        file.adjust_formatting(self.formatting)
-        self.action(self, env, file)
-        if root.is_dir() and ((level == 0 and (self.d1 or self.dr)) or self.dr) and not self.dir_already_visited(root):
+    def visit(self, env, root, directory_reader):
+        # Depth-first, pre-order traversal. An explicit stack is used instead of recursion, so that deep
+        # directory trees don't hit the recursion limit. Stack entries are (path, DirEntry, level). The DirEntry
+        # is None for a root. Otherwise it comes from os.scandir, and caches file type information, avoiding
+        # a stat call per entry. For a DirEntry, path is None, and the Path is created when the entry is popped,
+        # so that a large directory doesn't have a Path per entry sitting on the stack.
+        stack = [(root, None, 0)]
+        while len(stack) > 0:
+            path, entry, level = stack.pop()
+            if path is None:
+                path = pathlib.Path(entry.path)
             try:
-                root_stat = root.stat()
-                self.visited_dirs.add((root_stat.st_dev, root_stat.st_ino))
-                sorted_dir_contents = sorted(root.iterdir())
-                for file in sorted_dir_contents:
-                    try:
-                        self.visit(env, file, level + 1)
-                    except PermissionError:
-                        self.non_fatal_error(env, input=file, message='Permission denied')
-                    except FileNotFoundError:
-                        self.non_fatal_error(env, input=file, message='No such file or directory')
-                    except marcel.exception.KillAndResumeException:
-                        pass
+                file = File(path, self.base, self.metadata_cache, FilenamesOp.entry_lstat(entry))
+                file.adjust_formatting(self.formatting)
+                self.action(self, env, file)
+                if ((level == 0 and (self.d1 or self.dr)) or self.dr) and self.explore(entry, path):
+                    sorted_dir_contents = directory_reader.read(entry.path if entry else str(path))
+                    # Push in reverse order so that directory contents are visited in sorted order.
+                    for dir_entry in reversed(sorted_dir_contents):
+                        stack.append((None, dir_entry, level + 1))
+                    directory_reader.read_ahead(stack)
             except PermissionError:
-                self.non_fatal_error(env, input=root, message='Permission denied')
+                self.non_fatal_error(env, input=path, message='Permission denied')
             except FileNotFoundError:
-                self.non_fatal_error(env, input=root, message='No such file or directory')
+                self.non_fatal_error(env, input=path, message='No such file or directory')
             except marcel.exception.KillAndResumeException:
                 pass
 
+    # Paths found by visiting a root are inside the root, so paths from different roots can only coincide
+    # if one root is inside another, (within reach of the traversal depth).
+    def roots_overlap(self):
+        if self.d0 or len(self.roots) < 2:
+            return False
+        roots = set(self.roots)
+        for root in self.roots:
+            if self.d1:
+                if root.parent in roots:
+                    return True
+            else:
+                for parent in root.parents:
+                    if parent in roots:
+                        return True
+        return False
+
     def determine_base(self):
         # nca: nearest common ancestor
         nca_parts = None
@@ -148,14 +187,104 @@ class FilenamesOp(marcel.core.Op):
         if self.base.is_file():
             self.base = self.base.parent
 
-    def dir_already_visited(self, path):
-        # There could be multiple paths to a directory due to symlinks. Check if path is a symlink to a directory
-        # that has already been visited.
-        assert path.is_dir(), path
-        if path.is_symlink():
-            target = path.resolve()
-            target_stat = target.stat()
-            target_id = (target_stat.st_dev, target_stat.st_ino)
-            if target_id in self.visited_dirs:
-                return True
-        return False
+    # A DirEntry caches its lstat result, and for a directory that isn't a symlink, explore's stat call reuses
+    # it. Passing it to File avoids another lstat. If the lstat fails, File will lstat again, and report
+    # the problem.
+    @staticmethod
+    def entry_lstat(entry):
+        if entry:
+            try:
+                return entry.stat(follow_symlinks=False)
+            except OSError:
+                pass
+        return None
+
+    # Returns True if the file, given by a DirEntry, or for a root, a Path, is a directory whose contents
+    # should be visited. is_dir and stat follow symlinks, so a symlink to a directory is explored, unless the
+    # directory has already been visited. (There could be multiple paths to a directory due to symlinks.)
+    # A DirEntry caches file type information and the stat result, so this costs at most one stat call.
+    def explore(self, entry, path):
+        if entry:
+            if not entry.is_dir():
+                return False
+            dir_stat = entry.stat()
+            is_symlink = entry.is_symlink()
+        else:
+            if not path.is_dir():
+                return False
+            dir_stat = path.stat()
+            is_symlink = path.is_symlink()
+        dir_id = (dir_stat.st_dev, dir_stat.st_ino)
+        if is_symlink and dir_id in self.visited_dirs:
+            return False
+        self.visited_dirs.add(dir_id)
+        return True
+
+
+# Reads directory contents, sorted by name. During a recursive traversal, once directory reads turn out to be
+# slow, (e.g. NFS, or a cold cache), directories near the top of the traversal stack are read ahead by a thread
+# pool, so that several reads are outstanding at once. (os.scandir releases the GIL while reading.) Results
+# are still consumed by the traversing thread, in traversal order. Read-ahead isn't started for fast reads,
+# because then the cost of coordinating threads exceeds the savings.
+class DirectoryReader(object):
+
+    THREADS = 8
+    # A directory read taking at least this long starts read-ahead.
+    SLOW_READ_SEC = 0.005
+    # Maximum number of stack entries examined, looking for directories to read ahead.
+    READ_AHEAD_SCAN = 64
+
+    def __init__(self, recursive):
+        self.recursive = recursive
+        self.pool = None
+        # str(path) -> Future returning the sorted contents of the directory
+        self.pending = {}
+
+    def read(self, path):
+        future = self.pending.pop(str(path), None)
+        if future:
+            return future.result()
+        start = time.monotonic()
+        dir_contents = DirectoryReader.sorted_contents(path)
+        if (self.recursive and
+                self.pool is None and
+                time.monotonic() - start >= DirectoryReader.SLOW_READ_SEC):
+            self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=DirectoryReader.THREADS)
+        return dir_contents
+
+    def read_ahead(self, stack):
+        if self.pool:
+            n_read_ahead = 0
+            for i in range(len(stack) - 1, max(len(stack) - DirectoryReader.READ_AHEAD_SCAN, 0) - 1, -1):
+                _, entry, _ = stack[i]
+                try:
+                    # Symlinks are skipped: the directory may already have been visited (e.g. a cycle),
+                    # in which case the traversal won't read it.
+                    if entry is not None and entry.is_dir() and not entry.is_symlink():
+                        key = entry.path
+                        if key not in self.pending:
+                            self.pending[key] = self.pool.submit(DirectoryReader.sorted_contents, key)
+                        n_read_ahead += 1
+                        if n_read_ahead == DirectoryReader.THREADS:
+                            break
+                except OSError:
+                    # The traversal will encounter and report the error.
+                    pass
+
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        self.pending.clear()
+
+    # Output is sorted by name, so a directory's contents have to be read before any of them can be emitted.
+    # Sort in place, to avoid a second list.
+    @staticmethod
+    def sorted_contents(path):
+        with os.scandir(path) as dir_contents:
+            dir_contents = list(dir_contents)
+        dir_contents.sort(key=DirectoryReader.entry_name)
+        return dir_contents
+
+    @staticmethod
+    def entry_name(dir_entry):
+        return dir_entry.name
@@ -55,6 +55,9 @@ class GenArgsParser(marcel.argsparser.ArgsParser):
 
 class Gen(marcel.core.Op):
 
+    # Bounded output is sent in batches of this size.
+    BATCH_SIZE = 1000
+
     def __init__(self):
         super().__init__()
         self.count_arg = None
@@ -96,8 +99,10 @@ class Gen(marcel.core.Op):
                 self.send(env, self.apply_padding(x))
                 x += 1
         else:
-            for x in range(self.start, self.start + self.count):
-                self.send(env, self.apply_padding(x))
+            stop = self.start + self.count
+            for batch_start in range(self.start, stop, Gen.BATCH_SIZE):
+                batch = range(batch_start, min(batch_start + Gen.BATCH_SIZE, stop))
+                self.send_batch(env, [self.apply_padding(x) for x in batch] if self.format else list(batch))
 
     # Op
 
@@ -114,13 +114,15 @@ class Ls(marcel.op.filenamesop.FilenamesOp):
     @staticmethod
     def send_path(op, env, file):
         assert type(file) is File, f'{type(file)} {file}'
-        file_stat = file.path.lstat()
-        mode = file_stat.st_mode
-        s = stat.S_ISLNK(mode)
-        f = stat.S_ISREG(mode) and not s
-        d = stat.S_ISDIR(mode) and not s
-        if ((op.file and f) or (op.dir and d) or (op.symlink and s)) and file.path not in op.emitted_paths:
-            op.emitted_paths.add(file.path)
+        # One lstat classifies the file. It is cached by the File (FilenamesOp.visit has already called
+        # adjust_formatting, which needs it), so file.mode doesn't hit the filesystem again.
+        if stat.S_IFMT(file.mode) in op.file_types:
+            emitted_paths = op.emitted_paths
+            if emitted_paths is not None:
+                path = str(file.path)
+                if path in emitted_paths:
+                    return
+                emitted_paths.add(path)
             try:
                 op.send(env, file)
             except ValueError as e:
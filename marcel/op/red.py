@@ -14,6 +14,7 @@
 # along with Marcel.  If not, see <https://www.gnu.org/licenses/>.
 
 import types
+import operator
 
 import marcel.argsparser
 import marcel.core
@@ -173,6 +174,9 @@ class Reducer:
     def __init__(self, op):
         self.op = op
         self.n = len(self.op.functions)
+        # For use in receive, to avoid going through op for each input.
+        self.incremental = op.incremental
+        self.send = op.send
 
     def receive(self, env, x):
         assert False
@@ -180,6 +184,21 @@ class Reducer:
     def flush(self, env):
         assert False
 
+    # Returns a function computing the next accumulator from the current one and the input to be reduced.
+    # An exception raised by a reduction function leaves the accumulator unchanged. Reducing one or two
+    # values is most common, and for these, the function avoids looping over positions. The accumulator
+    # returned is a tuple, so that incremental output can be formed by concatenating it to the input.
+    @staticmethod
+    def step_function(functions):
+        n = len(functions)
+        if n == 1:
+            f0, = functions
+            return lambda accumulator, x: (f0(accumulator[0], x[0]),)
+        if n == 2:
+            f0, f1 = functions
+            return lambda accumulator, x: (f0(accumulator[0], x[0]), f1(accumulator[1], x[1]))
+        return lambda accumulator, x: tuple([f(a, xi) for f, a, xi in zip(functions, accumulator, x)])
+
 
 class NonGroupingReducer(Reducer):
 
@@ -190,20 +209,18 @@ class NonGroupingReducer(Reducer):
         for i in range(self.n):
             if self.op.functions[i].is_count():
                 self.accumulator[i] = 0
+        self.step = Reducer.step_function(op.functions)
 
     def receive(self, env, x):
-        op = self.op
         if len(x) < self.n:
-            op.fatal_error(env, x, 'Input too short.')
-        accumulator = self.accumulator
-        functions = op.functions
-        for i in range(self.n):
-            assert functions is not None
-            assert accumulator is not None
-            assert x is not None
-            accumulator[i] = op.call(env, functions[i], accumulator[i], x[i])
-        if op.incremental:
-            op.send(env, x + tuple(accumulator))
+            self.op.fatal_error(env, x, 'Input too short.')
+        try:
+            accumulator = self.step(self.accumulator, x)
+        except Exception as e:
+            self.op.fatal_error(env, x, str(e))
+        self.accumulator = accumulator
+        if self.incremental:
+            self.send(env, x + accumulator)
 
     def flush(self, env):
         op = self.op
@@ -219,39 +236,55 @@ class GroupingReducer(Reducer):
         super().__init__(op)
         self.grouping_positions = grouping_positions
         self.data_positions = data_positions
-        self.accumulators = {}  # group -> accumulator
+        # group -> accumulator. An accumulator holds the reductions of the data positions only. Group values
+        # are placed among them when output is generated, in flush.
+        self.accumulators = {}
+        # Group key and data of an input. itemgetter does the indexing in C. The group key is a scalar if
+        # there is one grouping position, which is fine for a dict key.
+        self.group = operator.itemgetter(*grouping_positions)
+        self.data = GroupingReducer.tuple_getter(data_positions)
+        self.step = Reducer.step_function([op.functions[p] for p in data_positions])
+        self.empty_accumulator = (None,) * len(data_positions)
 
     def receive(self, env, x):
-        op = self.op
         if len(x) < self.n:
-            op.fatal_error(env, x, 'Input too short.')
-        group = tuple(self.group(x))
-        accumulator = self.accumulators.get(group, None)
-        if accumulator is None:
-            accumulator = [None] * self.n
-            self.accumulators[group] = accumulator
-        for i in range(self.n):
-            reducer = op.functions[i]
-            accumulator[i] = x[i] if reducer.is_grouping() else op.call(env, reducer, accumulator[i], x[i])
-        if op.incremental:
-            op.send(env, x + tuple(self.data(accumulator)))
+            self.op.fatal_error(env, x, 'Input too short.')
+        group = self.group(x)
+        # A new group is recorded before reducing, so that it is output even if every reduction of it fails.
+        accumulator = self.accumulators.setdefault(group, self.empty_accumulator)
+        try:
+            accumulator = self.step(accumulator, self.data(x))
+        except Exception as e:
+            self.op.fatal_error(env, x, str(e))
+        self.accumulators[group] = accumulator
+        if self.incremental:
+            self.send(env, x + accumulator)
 
     def flush(self, env):
         op = self.op
         if not op.incremental and self.accumulators is not None:
-            for _, data in self.accumulators.items():
-                op.send(env, tuple(data))
-                self.accumulators = None
+            for group, accumulator in self.accumulators.items():
+                op.send(env, self.output(group, accumulator))
+            self.accumulators = None
         op.propagate_flush(env)
 
-    def group(self, x):
-        group = []
-        for p in self.grouping_positions:
-            group.append(x[p])
-        return group
-
-    def data(self, x):
-        data = []
-        for p in self.data_positions:
-            data.append(x[p])
-        return data
+    def output(self, group, accumulator):
+        output = [None] * self.n
+        if len(self.grouping_positions) == 1:
+            group = (group,)
+        for p, value in zip(self.grouping_positions, group):
+            output[p] = value
+        for p, value in zip(self.data_positions, accumulator):
+            output[p] = value
+        return tuple(output)
+
+    # Returns a function that returns a tuple of the items at the given positions, (itemgetter doesn't
+    # return a tuple for fewer than two positions).
+    @staticmethod
+    def tuple_getter(positions):
+        if len(positions) == 0:
+            return lambda x: ()
+        if len(positions) == 1:
+            p = positions[0]
+            return lambda x: (x[p],)
+        return operator.itemgetter(*positions)
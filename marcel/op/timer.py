@@ -17,6 +17,7 @@ import marcel.argsparser
 import marcel.core
 import marcel.exception
 
+import collections
 import threading
 import time
 
@@ -28,6 +29,11 @@ HELP = '''
 
 Generate a sequence of timestamps, separated in time by a specified {r:INTERVAL}.
 The output timestamp is time in seconds since 1/1/1970.
+
+If processing of a timestamp, (by the rest of the pipeline), takes longer than {r:INTERVAL},
+then the timestamps generated in the meantime are output as soon as that processing completes.
+At most 4 such timestamps are kept, the most recent ones. Older ones are dropped,
+so that output doesn't fall further and further behind.
 '''
 
 
@@ -45,13 +51,20 @@ class TimerArgsParser(marcel.argsparser.ArgsParser):
 
 class Timer(marcel.core.Op):
 
+    # Maximum number of ticks kept while downstream processing of the previous tick (or ticks) is in progress.
+    # Beyond this, the oldest ticks are dropped. Keep this small: a consumer that is always slower than the
+    # timer receives this many ticks each time it catches up, so it bounds how far behind output can get.
+    # (MAX_CATCH_UP = 1 would output only the most recent tick.) Update HELP if this is changed.
+    MAX_CATCH_UP = 4
+
     def __init__(self):
         super().__init__()
         self.metronome = None
         self.interval = None
         self.lock = None
+        self.tick = None
         self.done = False
-        self.now = None
+        self.ticks = None
 
     def __repr__(self):
         return f'timer({self.interval})'
@@ -59,7 +72,9 @@ class Timer(marcel.core.Op):
     # AbstractOp
     
     def setup(self, env):
-        self.lock = threading.Condition()
+        self.lock = threading.Lock()
+        self.tick = threading.Event()
+        self.ticks = collections.deque(maxlen=Timer.MAX_CATCH_UP)
         self.metronome = Metronome(self)
 
     # AbstractOp
@@ -72,17 +87,21 @@ class Timer(marcel.core.Op):
         # and the next timer event.
         self.metronome.start()
         while not self.done:
-            self.lock.acquire()
-            while self.now is None:
-                # If the timeout is omitted from the wait call, then ctrl-c
-                # cannot interrupt. The threading module implements wait
-                # differently if a timeout is specified, waking up periodically.
-                # TODO: Still true?
-                self.lock.wait(1.0)
-            now = self.now
-            self.now = None
-            self.lock.release()
-            self.send(env, now)
+            # Sleeps until the metronome ticks. (Waiting without a timeout can be
+            # interrupted by ctrl-c: lock acquisition is interruptible on POSIX.)
+            self.tick.wait()
+            # Taking the ticks and clearing tick are atomic with respect to register_tick,
+            # so a tick arriving during send is neither lost nor reported twice.
+            with self.lock:
+                ticks = self.ticks
+                self.ticks = collections.deque(maxlen=Timer.MAX_CATCH_UP)
+                self.tick.clear()
+            # The ticks that arrived while the previous ones were being processed downstream,
+            # (the most recent MAX_CATCH_UP of them), are sent together.
+            if len(ticks) == 1:
+                self.send(env, ticks[0])
+            else:
+                self.send_batch(env, list(ticks))
 
     # Op
 
@@ -92,21 +111,30 @@ class Timer(marcel.core.Op):
     # For use by this module
 
     def register_tick(self):
-        self.lock.acquire()
-        self.now = time.time()
-        self.lock.notifyAll()
-        self.lock.release()
+        with self.lock:
+            self.ticks.append(time.time())
+            self.tick.set()
 
 
 class Metronome(threading.Thread):
 
     def __init__(self, op):
-        threading.Thread.__init__(self)
+        threading.Thread.__init__(self, name=f'marcel-timer-{id(op):x}', daemon=True)
         self.interval = op.interval
         self.timer = op
-        self.daemon = True
 
     def run(self):
+        # Ticks are scheduled at absolute (monotonic) deadlines. Sleeping for the interval after each tick
+        # would let the time taken by register_tick accumulate as drift.
+        interval = self.interval
+        next_tick = time.monotonic()
         while True:
             self.timer.register_tick()
-            time.sleep(self.interval)
+            next_tick += interval
+            now = time.monotonic()
+            if next_tick <= now and interval > 0:
+                # Fell behind, (e.g. the system was suspended). Skip the missed ticks, staying on schedule.
+                next_tick += ((now - next_tick) // interval + 1) * interval
+            # Always sleep, even if the deadline has passed (e.g. interval <= 0), so that this thread
+            # releases the GIL on every tick.
+            time.sleep(max(next_tick - now, 0))
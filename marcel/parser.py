@@ -1061,12 +1061,12 @@ class Parser(object):
     def map_op(self, expr):
         return ConstructedString(self, 'map'), [expr]
 
+    # Iterative, (not recursing for each op), so that long pipelines don't hit the recursion limit.
     def op_sequence(self):
-        op_args = [self.op_args()]
-        if self.next_token(Pipe):
-            return op_args + self.op_sequence()
-        else:
-            return op_args
+        op_sequence = [self.op_args()]
+        while self.next_token(Pipe):
+            op_sequence.append(self.op_args())
+        return op_sequence
 
     # Returns (op name, list of arg tokens)
     def op_args(self):
@@ -1195,7 +1195,7 @@ class Parser(object):
     def create_op_variable(self, op_token, arg_tokens, undefined_var_ok=False):
         if op_token.is_var() or undefined_var_ok:
             var = op_token.value()
-            op = self.op_modules['runpipeline'].create_op()
+            op = self.env.runpipeline_op()
             op.var = var
             if len(arg_tokens) > 0:
                 pipeline_args = []
@@ -27,8 +27,6 @@ import sys
 import time
 import traceback
 
-import dill
-
 
 def python_version():
     return sys.version_info.major, sys.version_info.minor
@@ -111,15 +109,6 @@ def normalize_path(x):
     return x
 
 
-def copy(x):
-    try:
-        return dill.loads(dill.dumps(x))
-    except Exception as e:
-        sys.stdout.flush()
-        print(f'Cloning error on {type(x)}: ({type(e)}) {e}', file=sys.__stderr__, flush=True)
-        print_stack_of_current_exception(sys.__stderr__)
-
-
 def print_stack_of_current_exception(file=None):
     if file is None:
         file = sys.__stderr__
@@ -221,19 +210,24 @@ def accessible(dir):
         return accessible
 
 
+# If not enabled, nothing is written, and the tracefile isn't created. Callers tracing in performance-critical
+# code should check enabled before formatting a line.
 class Trace:
 
-    def __init__(self, tracefile, replace=False):
+    def __init__(self, tracefile, replace=False, enabled=True):
         self.path = pathlib.Path(tracefile)
-        if replace:
-            self.path.unlink(missing_ok=True)
-        self.path.touch(exist_ok=True)
-        self.path.chmod(0o0666)
+        self.enabled = enabled
+        if enabled:
+            if replace:
+                self.path.unlink(missing_ok=True)
+            self.path.touch(exist_ok=True)
+            self.path.chmod(0o0666)
 
     def write(self, line):
-        with self.path.open(mode='a') as file:
-            print(f'{os.getpid()}: {line}', file=file, flush=True)
+        if self.enabled:
+            with self.path.open(mode='a') as file:
+                print(f'{os.getpid()}: {line}', file=file, flush=True)
 
     # Caller is responsible for closing, e.g. with TRACE.open(...) as file ...
     def open(self):
-        return self.path.open(mode='a')
+        return self.path.open(mode='a') if self.enabled else open(os.devnull, mode='a')
@@ -592,6 +592,23 @@ def test_window():
              expected_out=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
 
 
+@timeit
+def test_timer():
+    # timer runs until killed, so just set up the pipeline and check the interval.
+    def timer_interval(interval):
+        pipeline = timer(interval).create_pipeline()
+        pipeline.setup(TEST.env)
+        return pipeline.first_op().interval
+    TEST.run(lambda: timer_interval(1),
+             expected_return=1.0)
+    TEST.run(lambda: timer_interval(0.5),
+             expected_return=0.5)
+    TEST.run(lambda: timer_interval('2'),
+             expected_return=2.0)
+    TEST.run(lambda: timer_interval('x'),
+             expected_exception='cannot be converted to float')
+
+
 @timeit
 def test_bash():
     with TestDir(TEST.env) as testdir:
@@ -2026,6 +2043,7 @@ def main_stable():
     test_squish()
     test_unique()
     test_window()
+    test_timer()
     test_bash()
     # test_namespace()
     test_source_filenames()
@@ -9,6 +9,8 @@ import marcel.version
 import marcel.object.cluster
 import marcel.object.error
 import marcel.object.workspace
+import marcel.op.filenamesop
+import marcel.parser
 import marcel.version
 
 import test_base
@@ -104,6 +106,11 @@ def test_gen():
     # Error along with output
     TEST.run('gen 3 -1 | map (x: 5 / x)',
              expected_out=[-5.0, Error('division by zero'), 5.0])
+    # Output spanning several batches
+    TEST.run('gen 2500 1 | map (x: (x, x, x)) | red count + max',
+             expected_out=[(2500, 3126250, 2500)])
+    TEST.run('gen -p 4 1002 | map (x: (x, pos())) | tail 2',
+             expected_out=[('1000', 1000), ('1001', 1001)])
     # # Function-valued args
     # TEST.run('N = (7)')
     # TEST.run('gen (N - 2)',
@@ -230,6 +237,12 @@ def test_map():
              expected_out=[0, -1, -2, -3, -4])
     TEST.run('map (3)',
              expected_out=[3])
+    # Parse a pipeline longer than the recursion limit. (Not run: execution still recurses once per op.)
+    long_pipeline = 'gen 3 | ' + ' | '.join(['map (x: x + 1)'] * sys.getrecursionlimit())
+    try:
+        marcel.parser.Parser(long_pipeline, TEST.env).parse()
+    except RecursionError:
+        TEST.fail('Parse long pipeline', 'RecursionError')
     TEST.run('map (: 3)',
              expected_out=[3])
     TEST.run('map (lambda: 3)',
@@ -335,6 +348,12 @@ def test_red():
     # Bug 242
     TEST.run('gen 3 | red growset',
              expected_out=[{0, 1, 2}])
+    # Error in a reduction function: the input is not reduced
+    TEST.run('gen 5 | map (x: (x, x - 2)) | red + (acc, x: 0 if acc is None else acc + 10 / x)',
+             expected_out=[Error('division by zero'), (8, 5.0)])
+    # Every reduction of a group fails: the group is still output
+    TEST.run('gen 3 | map (x: (x, x - 1)) | red . (acc, x: 10 / x if acc is None else acc + 10 / x)',
+             expected_out=[Error('division by zero'), (0, -10.0), (1, None), (2, 10.0)])
 
 
 @timeit
@@ -421,6 +440,9 @@ def test_expand():
     # Expand generator-like objects (having __next__)
     TEST.run('(zip([1, 2, 3], [4, 5, 6])) | expand',
              expected_out=[(1, 4), (2, 5), (3, 6)])
+    # An error downstream doesn't stop expansion of the rest of the input
+    TEST.run('gen 1 | map (x: [1, 0, 2]) | expand | map (x: 6 / x)',
+             expected_out=[6.0, Error('division by zero'), 3.0])
 
 
 @timeit
@@ -767,6 +789,46 @@ def test_ls():
                                       'f', 'sf', 'lf', 'sd', 'd',  # Top-level
                                       'd/df', 'd/sdf', 'd/ldf', 'd/dd', 'd/sdd',  # Contents of d
                                       'd/dd/ddf']))
+    # Hard links are listed separately. Paths identified by more than one root are listed once.
+    with TestDir(TEST.env) as testdir:
+        os.system(f'touch {testdir}/a')
+        os.system(f'ln {testdir}/a {testdir}/b')
+        TEST.run(f'ls -f {testdir} | map (f: f.render_compact())',
+                 expected_out=['a', 'b'])
+        TEST.run(f'ls -f {testdir}/a {testdir}/? | map (f: f.render_compact())',
+                 expected_out=['a', 'b'])
+        # One root inside another
+        TEST.run(f'ls -f {testdir} {testdir}/a | map (f: f.render_compact())',
+                 expected_out=['a', 'b'])
+        TEST.run(f'ls -fr {testdir} {testdir}/b | map (f: f.render_compact())',
+                 expected_out=['a', 'b'])
+    # Reading directories ahead, in other threads, yields the same output as the sequential walk.
+    with TestDir(TEST.env) as testdir:
+        for d in ('d1', 'd2', 'd3', 'd1/e1', 'd1/e2', 'd3/e3'):
+            os.system(f'mkdir {testdir}/{d}')
+            os.system(f'touch {testdir}/{d}/f')
+        os.system(f'ln -s {testdir} {testdir}/d1/e1/cycle')
+        os.system(f'ln -s {testdir}/d3 {testdir}/d1/sd3')
+        os.system(f'sudo chown root.root {testdir}/d2')
+        os.system(f'sudo chmod 700 {testdir}/d2')
+        slow_read_sec = marcel.op.filenamesop.DirectoryReader.SLOW_READ_SEC
+        try:
+            marcel.op.filenamesop.DirectoryReader.SLOW_READ_SEC = math.inf
+            sequential, _ = TEST.run_and_capture_output(f'ls -r {testdir} | map (f: f.render_compact())')
+            marcel.op.filenamesop.DirectoryReader.SLOW_READ_SEC = 0
+            TEST.run(test=f'ls -r {testdir} | map (f: f.render_compact())',
+                     expected_out=sequential)
+        finally:
+            marcel.op.filenamesop.DirectoryReader.SLOW_READ_SEC = slow_read_sec
+        # Restore owner so that cleanup can proceed
+        me = os.getlogin()
+        os.system(f'sudo chown {me}.{me} {testdir}/d2')
+    # Directory tree deeper than the recursion limit
+    with TestDir(TEST.env) as testdir:
+        depth = sys.getrecursionlimit() + 100
+        os.system(f'mkdir -p {testdir}/' + '/'.join(['d'] * depth))
+        TEST.run(f'ls -r {testdir} | red count',
+                 expected_out=[depth + 1])
 
 
 # pushd, popd, dirs, cd